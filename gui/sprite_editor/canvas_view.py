@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import tkinter as tk
+import warnings
 from typing import Optional
 
 import numpy as np
@@ -7,6 +9,8 @@ import customtkinter as ctk
 from PIL import Image, ImageTk
 from PIL.Image import Resampling
 
+from .sprite_core import frame_rgba
+
 
 class CanvasView:
     """Encapsulates the drawing canvas and preview rendering logic."""
@@ -16,10 +20,17 @@ class CanvasView:
         self.cell_px = 22
         self.canvas: Optional[ctk.CTkCanvas] = None
         self.canvas_img_id: Optional[int] = None
-        self._canvas_img: Optional[ImageTk.PhotoImage] = None
+        self._canvas_src: Optional[ImageTk.PhotoImage] = None
+        self._canvas_img: Optional[tk.PhotoImage] = None
+        self._cell_photo: Optional[ImageTk.PhotoImage] = None
         self.preview_label: Optional[ctk.CTkLabel] = None
-        self._preview_photo: Optional[ctk.CTkImage] = None
+        self._preview_photo: Optional[ImageTk.PhotoImage] = None
         self.max_size = 256
+        self._redraw_pending = False
+        self._canvas_dirty = False
+        self._grid_key: Optional[tuple[int, int, int, str]] = None
+        self._onion_cache: Optional[
+            tuple[np.ndarray, np.ndarray, np.ndarray]] = None
 
     def build(self, parent: ctk.CTkFrame) -> None:
         """ Create the canvas area with scrollbars and mouse bindings. """
@@ -70,43 +81,93 @@ class CanvasView:
 
     def set_preview_label(self, label: ctk.CTkLabel) -> None:
         self.preview_label = label
+        self._preview_photo = None
 
-    def redraw_canvas(self, *_args) -> None:
+    def redraw_canvas(self, *_args) -> Optional[np.ndarray]:
         """
         Redraw the entire sprite grid on the canvas.
 
         Re-renders the active frame’s pixel matrix into the offscreen
         `PhotoImage`, optionally overlaying the previous frame as an
-        onion-skin layer for animation guidance.
+        onion-skin layer for animation guidance. The frame is uploaded at
+        native size and Tk's photo `copy -zoom` scales it to `cell_px`.
 
         Also:
-          - Regenerates grid lines based on `self.cell_px`
+          - Recreates the grid lines if size, zoom or grid color changed
           - Updates the canvas scrollregion to match the new image size
           - Ensures consistent redraws after zoom or paint actions
+
+        Returns the active frame's RGBA without onion skin, which
+        `update_preview` can take instead of rendering it again.
         """
         if not self.canvas:
-            return
+            return None
 
         if self.canvas_img_id is None:
             self.canvas_img_id = self.canvas.create_image(0, 0, anchor='nw')
+            self.canvas.tag_raise('grid')
 
         doc = self.editor.doc
         width_px = doc.width * self.cell_px
         height_px = doc.height * self.cell_px
         self.canvas.configure(width=width_px, height=height_px)
-        self.canvas.delete('grid')
 
-        base = self._compose_frame_with_onion_skin(doc)
+        # Upload at native size; Tk zooms into the displayed photo itself.
+        # Both photos persist and are only recreated when the size changes.
+        frame, composed = self._compose_rgba(doc)
+        base = self._frame_image(composed)
+        if (self._canvas_src is None or
+                (self._canvas_src.width(),
+                 self._canvas_src.height()) != base.size):
+            self._canvas_src = ImageTk.PhotoImage(base)
+        else:
+            self._canvas_src.paste(base)
+        self.show_photo(self._canvas_src)
+        self.canvas.configure(scrollregion=(0, 0, width_px, height_px))
+        self._update_grid_lines()
+        return frame
+
+    def refresh(self) -> None:
+        """ Redraw the canvas and the preview, rendering the frame once """
+        self.update_preview(self.redraw_canvas())
+
+    def frame_photo(self, index: int) -> ImageTk.PhotoImage:
+        """ Native-size photo of frame `index` as the canvas shows it """
+        _, composed = self._compose_rgba(self.editor.doc, index)
+        return ImageTk.PhotoImage(self._frame_image(composed))
+
+    def show_photo(self, photo) -> None:
+        """ Zoom a native-size photo into the displayed canvas image """
+        if self._canvas_img is None:
+            self._canvas_img = tk.PhotoImage(master=self.canvas)
+            self.canvas.itemconfig(self.canvas_img_id, image=self._canvas_img)
+        self._canvas_img.tk.call(
+            self._canvas_img, 'copy', photo,
+            '-zoom', self.cell_px, self.cell_px,
+            '-compositingrule', 'set', '-shrink')
+
+    @staticmethod
+    def _frame_image(rgba: np.ndarray) -> Image.Image:
+        height, width = rgba.shape[:2]
+        return Image.frombuffer('RGBA', (width, height), rgba,
+                                'raw', 'RGBA', 0, 1)
 
-        if self.cell_px != 1:
-            base = base.resize(
-                (doc.width * self.cell_px, doc.height * self.cell_px),
-                Resampling.NEAREST)
+    def _update_grid_lines(self) -> None:
+        """
+        Recreate the grid lines when size, zoom or color changed.
 
-        self._canvas_img = ImageTk.PhotoImage(base)
-        self.canvas.itemconfig(self.canvas_img_id, image=self._canvas_img)
-        self.canvas.configure(scrollregion=(0, 0, base.width, base.height))
+        The `grid`-tagged line items stay on the canvas between redraws;
+        painting and frame switches leave them untouched.
+        """
+        doc = self.editor.doc
+        key = (doc.width, doc.height, self.cell_px, self.editor.grid_color)
+        if key == self._grid_key:
+            return
+        self._grid_key = key
 
+        self.canvas.delete('grid')
+        width_px = doc.width * self.cell_px
+        height_px = doc.height * self.cell_px
         for y in range(doc.height + 1):
             self.canvas.create_line(
                 0,
@@ -126,7 +187,7 @@ class CanvasView:
                 tags='grid',
             )
 
-    def update_preview(self) -> None:
+    def update_preview(self, rgba: Optional[np.ndarray] = None) -> None:
         """
         Render the active frame to a small thumbnail preview.
 
@@ -134,52 +195,68 @@ class CanvasView:
         nearest-neighbor sampling for a crisp pixel-art result.
 
         The preview is then displayed in the right-hand 'Preview' label.
+        `rgba` is the active frame as `redraw_canvas` just rendered it;
+        without it the frame is rendered here.
         """
 
         if not self.preview_label:
             return
 
-        img = self.render_frame(self.editor.active_frame, scale=1)
-        if img.width < 1 or img.height < 1:
+        if rgba is None:
+            doc = self.editor.doc
+            rgba = frame_rgba(doc.frames[self.editor.active_frame].pixels,
+                              doc.palette_u32())
+        height, width = rgba.shape[:2]
+        if width < 1 or height < 1:
             return
 
-        if img.width > self.max_size or img.height > self.max_size:
-            img = img.resize(
-                (min(img.width, self.max_size),
-                 min(img.height, self.max_size)),
-                Resampling.NEAREST)
-
-        scale = min(4, int(self.max_size / max(img.width, img.height)))
-        preview = img.resize(
-            (int(img.width * scale), int(img.height * scale)),
-            Resampling.NEAREST)
-
-        self._preview_photo = ctk.CTkImage(
-            light_image=preview,
-            dark_image=preview,
-            size=(preview.width, preview.height),
-        )
-        self.preview_label.configure(image=self._preview_photo)
+        if width > self.max_size or height > self.max_size:
+            rgba = np.asarray(Image.fromarray(rgba, mode='RGBA').resize(
+                (min(width, self.max_size), min(height, self.max_size)),
+                Resampling.NEAREST))
+            height, width = rgba.shape[:2]
+
+        scale = min(4, int(self.max_size / max(width, height)))
+        preview = Image.fromarray(self._upscale(rgba, scale), mode='RGBA')
+
+        # Size for the label's DPI scaling, the part CTkImage would add
+        scaling = ctk.ScalingTracker.get_widget_scaling(self.preview_label)
+        size = (round(preview.width * scaling),
+                round(preview.height * scaling))
+        if size != preview.size:
+            preview = preview.resize(size, Resampling.NEAREST)
+
+        # One photo persists and is only recreated when the size changes;
+        # pasting updates the label without a new Tk image per refresh
+        if (self._preview_photo is not None and
+                (self._preview_photo.width(),
+                 self._preview_photo.height()) == size):
+            self._preview_photo.paste(preview)
+            return
+        self._preview_photo = ImageTk.PhotoImage(preview)
+        with warnings.catch_warnings():
+            # CTkLabel warns that a plain photo is not DPI-scaled; this
+            # one already is
+            warnings.simplefilter('ignore')
+            self.preview_label.configure(image=self._preview_photo)
 
     def render_frame(self, index: int, scale: int = 1) -> Image.Image:
         doc = self.editor.doc
 
-        img = self._frame_to_image(doc.frames[index].pixels, doc.palette)
-
-        if scale > 1:
-            img = img.resize((doc.width * scale, doc.height * scale),
-                             Resampling.NEAREST)
-        return img
+        rgba = frame_rgba(doc.frames[index].pixels, doc.palette_u32())
+        return Image.fromarray(self._upscale(rgba, scale), mode='RGBA')
 
     def paint_at(self, event) -> None:
         """
         Paint or fill pixels in response to a left-click or drag event.
 
         Determines the grid cell under the cursor and either:
-          - Paints a single pixel (`mat[y][x] = color_index`), or
+          - Paints a single pixel (`mat[y, x] = color_index`), or
           - Performs a flood-fill if fill mode is active.
 
-        Automatically triggers a redraw and preview update after changes.
+        A single-pixel paint is blitted straight into the displayed image;
+        fills schedule a full redraw. The preview is refreshed once per idle
+        cycle either way, so a fast drag does not repaint per event.
         """
         self.editor.focus_set()
         x, y = self._event_to_cell(event)
@@ -189,18 +266,72 @@ class CanvasView:
         matrix = doc.frames[self.editor.active_frame].pixels
 
         if self.editor.fill_mode:
-            target = matrix[y][x]
+            target = int(matrix[y, x])
             if target == self.editor.active_color_index:
                 return
             self._flood_fill(matrix, x, y, target,
                              self.editor.active_color_index)
         else:
-            if matrix[y][x] == self.editor.active_color_index:
+            if matrix[y, x] == self.editor.active_color_index:
+                return
+            matrix[y, x] = self.editor.active_color_index
+            if self._canvas_img is not None and not self._canvas_dirty:
+                self._blit_cell(x, y)
+                self.schedule_redraw(canvas=False)
                 return
-            matrix[y][x] = self.editor.active_color_index
 
-        self.redraw_canvas()
-        self.update_preview()
+        self.schedule_redraw()
+
+    def schedule_redraw(self, canvas: bool = True) -> None:
+        """
+        Queue one refresh for the next idle cycle.
+
+        The preview is always refreshed; the canvas only when `canvas` is
+        set by at least one of the coalesced requests.
+        """
+        self._canvas_dirty |= canvas
+        if self._redraw_pending:
+            return
+        self._redraw_pending = True
+        self.editor.after_idle(self._do_pending_redraw)
+
+    def _do_pending_redraw(self) -> None:
+        self._redraw_pending = False
+        rgba = None
+        if self._canvas_dirty:
+            self._canvas_dirty = False
+            rgba = self.redraw_canvas()
+        self.update_preview(rgba)
+
+    def _blit_cell(self, x: int, y: int) -> None:
+        """
+        Repaint one cell of the displayed image, onion skin included.
+
+        The cell goes through one persistent 1x1 photo, so a drag does not
+        allocate a Tk image per motion event.
+        """
+        doc = self.editor.doc
+        lut = doc.palette_u32()
+        idx = doc.frames[self.editor.active_frame].pixels[y, x]
+        cell = np.array([[lut[idx + 1]]], dtype=np.uint32)
+
+        if (idx < 0 and self.editor.onion_skin.get() and
+                self.editor.active_frame > 0):
+            onion = doc.frames[self.editor.active_frame - 1].pixels[y, x]
+            if onion >= 0:
+                cell[0, 0] = lut[onion + 1]
+                cell.view(np.uint8)[0, 3] = 90
+
+        pixel = Image.fromarray(cell.view(np.uint8).reshape(1, 1, 4), 'RGBA')
+        if self._cell_photo is None:
+            self._cell_photo = ImageTk.PhotoImage(pixel)
+        else:
+            self._cell_photo.paste(pixel)
+        self._canvas_img.tk.call(
+            self._canvas_img, 'copy', self._cell_photo,
+            '-zoom', self.cell_px, self.cell_px,
+            '-to', x * self.cell_px, y * self.cell_px,
+            '-compositingrule', 'set')
 
     def eyedrop_at(self, event) -> None:
         """ Selects the color from the selected pixel """
@@ -208,7 +339,7 @@ class CanvasView:
         doc = self.editor.doc
         if not (0 <= x < doc.width and 0 <= y < doc.height):
             return
-        idx = doc.frames[self.editor.active_frame].pixels[y][x]
+        idx = int(doc.frames[self.editor.active_frame].pixels[y, x])
         self.editor.select_color(idx)
 
     def zoom_changed(self, value) -> None:
@@ -232,17 +363,20 @@ class CanvasView:
         return int(cx // self.cell_px), int(cy // self.cell_px)
 
     @staticmethod
-    def _flood_fill(matrix: list, x: int, y: int, target_color: int,
+    def _flood_fill(matrix: np.ndarray, x: int, y: int, target_color: int,
                     replacement_color: int) -> None:
         """
         Perform 4-directional flood fill on the current frame matrix.
 
         Fills contiguous regions of `target_color` starting at `(x, y)`
-        with `replacement_color`. Uses an iterative stack-based approach
-        to avoid recursion depth limits.
+        with `replacement_color`. Works on horizontal spans over a list
+        copy of the rows, pushing only the start of every run above and
+        below, and writes the result back to the matrix once. Plain list
+        access keeps small and heavily textured regions cheap, where
+        per-span NumPy calls would cost more than the cells they cover.
 
         Args:
-            matrix: 2D list of palette indices.
+            matrix: 2D array of palette indices.
             x, y: Starting coordinates within the grid.
             target_color: Palette index to replace.
             replacement_color: Palette index to apply.
@@ -252,82 +386,95 @@ class CanvasView:
         """
         if target_color == replacement_color:
             return
-        height, width = len(matrix), len(matrix[0])
+        height, width = matrix.shape
+        rows = matrix.tolist()
         stack = [(x, y)]
         while stack:
             cx, cy = stack.pop()
-            if cx < 0 or cy < 0 or cx >= width or cy >= height:
-                continue
-            if matrix[cy][cx] != int(target_color):
+            row = rows[cy]
+            if row[cx] != target_color:
                 continue
-            matrix[cy][cx] = int(replacement_color)
-            stack.extend([
-                (cx + 1, cy),
-                (cx - 1, cy),
-                (cx, cy + 1),
-                (cx, cy - 1),
-            ])
-
-    @staticmethod
-    def _frame_to_rgba_array(matrix: list[list[int]],
-                             palette: list[list[int]]) -> np.ndarray:
-        """ Convert a frame matrix and palette into an RGBA NumPy array """
-        height = len(matrix)
-        width = len(matrix[0]) if height else 0
-        rgba = np.zeros((height, width, 4), dtype=np.uint8)
-
-        if height == 0 or width == 0:
-            return rgba
 
-        frame_array = np.asarray(matrix, dtype=np.int32).reshape(height, width)
+            # Grow the span left and right until a non-target cell
+            left = cx
+            while left > 0 and row[left - 1] == target_color:
+                left -= 1
+            right = cx + 1
+            while right < width and row[right] == target_color:
+                right += 1
+            row[left:right] = [replacement_color] * (right - left)
+
+            # Seed one point per target run directly above and below
+            for ny in (cy - 1, cy + 1):
+                if not 0 <= ny < height:
+                    continue
+                adjacent = rows[ny]
+                in_run = False
+                for nx in range(left, right):
+                    if adjacent[nx] == target_color:
+                        if not in_run:
+                            stack.append((nx, ny))
+                            in_run = True
+                    else:
+                        in_run = False
+
+        matrix[...] = rows
 
-        if palette:
-            palette_array = np.asarray(palette, dtype=np.uint8)
-            mask = frame_array >= 0
-            if np.any(mask):
-                indices = frame_array[mask]
-                colors = palette_array[indices]
-                rgba[mask] = colors
-
-        return rgba
-
-    @classmethod
-    def _frame_to_image(cls, matrix: list[list[int]],
-                        palette: list[list[int]]) -> Image.Image:
-        """ Convert a frame matrix and palette into a Pillow Image using NumPy """
-        return Image.fromarray(
-            cls._frame_to_rgba_array(matrix, palette), mode='RGBA')
+    @staticmethod
+    def _upscale(rgba: np.ndarray, factor: int) -> np.ndarray:
+        """
+        Nearest-neighbor upscale by an integer factor.
 
-    def _compose_frame_with_onion_skin(self, doc) -> Image.Image:
-        """ Render the active frame and optional onion skin into a Pillow Image """
-        height, width = doc.height, doc.width
-        composed = np.zeros((height, width, 4), dtype=np.uint8)
+        Zoom is always a whole number of pixels per cell, so repeating rows
+        and columns is a plain strided copy and cheaper than a PIL resize.
+        """
+        if factor <= 1:
+            return rgba
+        return np.repeat(np.repeat(rgba, factor, axis=0), factor, axis=1)
 
-        palette_array = np.asarray(
-            doc.palette, dtype=np.uint8) if doc.palette else None
+    def _compose_rgba(
+            self, doc,
+            index: Optional[int] = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Render frame `index` (default: the active one) as RGBA, returning
+        the bare frame and the frame with the optional onion skin.
+        """
+        lut = doc.palette_u32()
+        if index is None:
+            index = self.editor.active_frame
+        active_matrix = doc.frames[index].pixels
+        active = frame_rgba(active_matrix, lut)
+        if not (self.editor.onion_skin.get() and index > 0):
+            return active, active
+
+        onion_matrix = doc.frames[index - 1].pixels
+
+        # One packed select: onion only shows through empty cells
+        height, width = active_matrix.shape
+        packed = np.where(active_matrix >= 0,
+                          active.view(np.uint32)[..., 0],
+                          self._onion_packed(onion_matrix, lut))
+        return active, packed.view(np.uint8).reshape(height, width, 4)
+
+    def _onion_packed(self, matrix: np.ndarray,
+                      lut: np.ndarray) -> np.ndarray:
+        """
+        Packed RGBA of the onion-skin frame at alpha 90.
 
-        if (palette_array is not None and
-                self.editor.onion_skin.get() and
-                self.editor.active_frame > 0):
-            onion_pixels = doc.frames[self.editor.active_frame - 1].pixels
-            onion_matrix = np.asarray(onion_pixels, dtype=np.int32).reshape(
-                height, width)
-            onion_mask = onion_matrix >= 0
-            if np.any(onion_mask):
-                onion_colors = palette_array[onion_matrix[onion_mask]].copy()
-                onion_colors[:, 3] = 90
-                composed[onion_mask] = onion_colors
-
-        if palette_array is not None:
-            active_pixels = doc.frames[self.editor.active_frame].pixels
-            active_matrix = np.asarray(active_pixels, dtype=np.int32).reshape(
-                height, width)
-            active_mask = active_matrix >= 0
-            if np.any(active_mask):
-                active_colors = palette_array[active_matrix[active_mask]]
-                composed[active_mask] = active_colors
-
-        return Image.fromarray(composed, mode='RGBA')
+        The previous frame rarely changes while the active one is painted,
+        so the result is cached against a snapshot of its indices and the
+        palette LUT; comparing is far cheaper than rendering again.
+        """
+        cache = self._onion_cache
+        if (cache is not None and cache[0] is lut and
+                np.array_equal(cache[1], matrix)):
+            return cache[2]
+
+        onion = frame_rgba(matrix, lut)
+        onion[..., 3] = np.where(matrix >= 0, 90, 0)
+        packed = onion.view(np.uint32)[..., 0]
+        self._onion_cache = (lut, matrix.copy(), packed)
+        return packed
 
     # Late import for type checking
     from typing import TYPE_CHECKING
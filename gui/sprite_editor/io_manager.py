@@ -2,19 +2,34 @@ from __future__ import annotations
 
 import json
 import logging
-import re
+import os
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from tkinter.filedialog import askopenfilename, asksaveasfilename
-from typing import Any
+from typing import Any, Callable, Iterator
 
 import customtkinter as ctk
+import numpy as np
 from PIL import Image
 
-from .sprite_core import SpriteDoc
+try:  # Optional: much faster parsing of large sprite files
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+from .sprite_core import PIXEL_DTYPE, SpriteDoc, frame_rgba
 from gdk.palette import PALETTES
 from gdk.utils import normalize_path
 
+# Perceptual weights applied to the per-channel color difference
+_COLOR_WEIGHTS = np.array([0.3, 0.59, 0.11])
+# Alpha below this counts as transparent on import
+_ALPHA_CUTOFF = 32
+# Upper bound on elements in the (rows, W, K, 3) distance temporary
+_QUANTIZE_CHUNK = 1 << 21
+
 
 class SpriteIOManager:
     """Handles persistence and external image import/export for sprites."""
@@ -29,6 +44,11 @@ class SpriteIOManager:
         self._last_export_dir: Path | None = None
         self._last_project_root: Path | None = None
 
+        # Encoding and disk I/O run here so the Tk loop stays responsive.
+        # One worker: jobs run in submit order, so two saves to the same
+        # file can never interleave.
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+
     # --- Directory resolution ------------------------------------------------
 
     def _resolve_dir(self, last_dir: Path | None) -> Path:
@@ -64,6 +84,32 @@ class SpriteIOManager:
         # Fallback
         return Path.cwd() / 'projects'
 
+    # --- Background jobs ----------------------------------------------------
+
+    def _submit(self, job: Callable[[], Any],
+                on_done: Callable[[Any], None]) -> None:
+        """ Run `job` on the I/O pool and hand its result back to Tk """
+        future = self._io_pool.submit(job)
+        future.add_done_callback(
+            lambda f: self.editor.after(
+                0, self._finish, f, on_done))  # type: ignore[arg-type]
+
+    @staticmethod
+    def _finish(future: Future, on_done: Callable[[Any], None]) -> None:
+        try:
+            result = future.result()
+        except Exception as e:
+            logging.exception(e)
+            return
+        on_done(result)
+
+    def _flush_metadata(self) -> None:
+        """
+        Apply any debounced metadata-panel edit before an export reads
+        the document, so it never sees fields up to 150 ms stale.
+        """
+        self.editor.metadata_panel.flush_pending()
+
     # --- Core document operations --------------------------------------------
 
     def new_doc(self) -> None:
@@ -92,19 +138,20 @@ class SpriteIOManager:
 
         self._last_open_dir = Path(path).parent
 
-        with open(path, 'r', encoding='utf-8') as handle:
-            data = json.load(handle)
+        def load() -> SpriteDoc:
+            return SpriteDoc.from_json(_load_json(Path(path)))
 
+        self._submit(load, partial(self._apply_opened_doc, Path(path)))
+
+    def _apply_opened_doc(self, path: Path, doc: SpriteDoc) -> None:
+        """ Swap in a document parsed by `open_doc` (Tk thread) """
         # Palette restore
-        palette_name = data.get('palette_name', 'ProtoX 64')
-        palette = PALETTES.get(palette_name, PALETTES['ProtoX 64'])
-        self.editor.doc.palette = palette
-        self.editor.palette_var.set(palette_name)
+        self.editor.palette_var.set(doc.palette_name)
 
         # Sync UI
-        self.editor.doc = SpriteDoc.from_json(data)
+        self.editor.doc = doc
         self.editor.active_frame = 0
-        self.editor.last_saved_path = Path(path)
+        self.editor.last_saved_path = path
         self.editor.rebuild_color_buttons(self.editor.palette_frame, 4, 25)
         self.editor.refresh_all()
         self.editor.metadata_panel.refresh_from_doc()
@@ -117,24 +164,26 @@ class SpriteIOManager:
             self.save_as_doc()
             return
 
-        # Inject palette name before save
+        # Commit any debounced metadata edit, then inject palette name
+        self.editor.metadata_panel.flush_pending()
         data = self.editor.doc.to_json()
         data['palette_name'] = self.editor.palette_var.get()
+        path = self.editor.last_saved_path
 
-        # Compact numeric formatting for lists
-        text = json.dumps(data, indent=2)
-        text = re.sub(
-            r'\[\s*((?:-?\d+\s*,\s*)*-?\d+)\s*]',
-            lambda m: "[ " + re.sub(r'\s*,\s*', ', ', m.group(1)) + " ]",
-            text
-        )
-
-        with open(self.editor.last_saved_path, 'w',
-                  encoding='utf-8') as handle:
-            handle.write(text)
+        def write() -> None:
+            # Compact numeric formatting for lists, streamed to a temp file
+            # next to the target and swapped in once complete
+            tmp = path.with_name(path.name + '.tmp')
+            try:
+                with open(tmp, 'w', encoding='utf-8') as handle:
+                    handle.writelines(_iter_compact(data))
+                os.replace(tmp, path)
+            finally:
+                if tmp.exists():
+                    tmp.unlink()
 
-        logging.info(
-            f'Saved sprite: {normalize_path(self.editor.last_saved_path)}')
+        self._submit(write, lambda _: logging.info(
+            f'Saved sprite: {normalize_path(path)}'))
 
     def save_as_doc(self) -> None:
         """Save the sprite with a new file name."""
@@ -157,6 +206,7 @@ class SpriteIOManager:
 
     def export_png(self) -> None:
         """Export the current frame as a PNG image."""
+        self._flush_metadata()
         path = asksaveasfilename(
             title='Export PNG (current frame)',
             defaultextension='.png',
@@ -168,13 +218,17 @@ class SpriteIOManager:
 
         self._last_export_dir = Path(path).parent
 
-        img = self.editor.canvas_view.render_frame(
-            self.editor.active_frame, scale=1)
-        img.save(path, 'PNG')
-        logging.info(f'Exported PNG to: {normalize_path(path)}')
+        matrix = self._frame_matrix(self.editor.active_frame)
+        encode = partial(_encode_png, path, matrix,
+                         self.editor.doc.palette_u32())
+
+        self._submit(
+            encode,
+            lambda _: logging.info(f'Exported PNG to: {normalize_path(path)}'))
 
     def export_gif(self) -> None:
         """Export the current frame as a GIF image."""
+        self._flush_metadata()
         path = asksaveasfilename(
             title='Export GIF (animated gif)',
             defaultextension='.gif',
@@ -186,20 +240,20 @@ class SpriteIOManager:
 
         self._last_export_dir = Path(path).parent
 
-        images = [self.editor.canvas_view.render_frame(i)
-                  for i in range(len(self.editor.doc.frames))]
-        frame_duration = max(1, self.editor.frame_time_var.get())
-
-        images[0].save(
-            path,
-            save_all=True,
-            append_images=images[1:],
-            duration=frame_duration,
-            loop=0 if self.editor.doc.loop else 1,
-            disposal=2,
-            transparency=0
-        )
-        logging.info(f'Exported GIF to: {normalize_path(path)}')
+        # Snapshot the matrices here, before the document leaves Tk
+        matrices = [self._frame_matrix(i)
+                    for i in range(len(self.editor.doc.frames))]
+        encode = partial(_encode_gif, path, matrices,
+                         self.editor.doc.palette_u32(),
+                         max(1, self.editor.frame_time_var.get()),
+                         0 if self.editor.doc.loop else 1)
+
+        self._submit(encode, lambda _: logging.info(
+            f'Exported GIF to: {normalize_path(path)}'))
+
+    def _frame_matrix(self, index: int) -> np.ndarray:
+        """ Copy a frame's palette indices out of the live document """
+        return self.editor.doc.frames[index].pixels.copy()
 
     # --- Import image --------------------------------------------------------
 
@@ -215,6 +269,7 @@ class SpriteIOManager:
             return
 
         self._last_import_dir = Path(path).parent
+        palette = self.editor.doc.palette_rgba()
 
         busy_label = ctk.CTkLabel(self.editor, text='  Importing...  ',
                                   text_color='orange')
@@ -226,23 +281,14 @@ class SpriteIOManager:
             try:
                 img = Image.open(path).convert('RGBA')
                 width, height = img.size
-                pixels = img.load()
-                matrix = [[-1 for _ in range(width)] for _ in range(height)]
-
-                for y in range(height):
-                    for x in range(width):
-                        r, g, b, a = pixels[x, y]
-                        if a < 32:
-                            matrix[y][x] = -1
-                            continue
-                        matrix[y][x] = self.find_closest_color((r, g, b, a))
+                matrix = _quantize(np.asarray(img), palette)
 
                 # 🟢 Apply result safely in main thread
                 def apply_result():
-                    self.editor.resize_grid(width, height)
-                    self.editor.doc.frames[
-                        self.editor.active_frame].pixels = matrix
-                    self.editor.refresh_all()
+                    with self.editor.batched_updates():
+                        self.editor.resize_grid(width, height)
+                        self.editor.doc.frames[
+                            self.editor.active_frame].pixels = matrix
                     busy_label.destroy()
                     self.editor.configure(cursor='')
 
@@ -264,23 +310,238 @@ class SpriteIOManager:
     # --- Color quantization --------------------------------------------------
 
     def find_closest_color(self, rgba: tuple[Any, ...]) -> int:
-        """Find the nearest color index in the active palette."""
-        r1, g1, b1, a1 = rgba
-        if a1 < 32:
-            return -1  # transparent
-
-        best_idx = 0
-        best_dist = float('inf')
-
-        for i, (r2, g2, b2, _a2) in enumerate(self.editor.doc.palette):
-            dr = r1 - r2
-            dg = g1 - g2
-            db = b1 - b2
-            dist = (dr * 0.3) ** 2 + (dg * 0.59) ** 2 + (db * 0.11) ** 2
-            if dist < best_dist:
-                best_dist = dist
-                best_idx = i
-        return best_idx
+        """
+        Find the nearest color index in the active palette.
+
+        Channels outside 0-255 are clamped to that range first.
+        """
+        pixel = np.clip(np.array([[rgba]]), 0, 255).astype(np.uint8)
+        return int(_quantize(pixel, self.editor.doc.palette_rgba())[0, 0])
+
+
+def _encode_png(path: str | Path, matrix: np.ndarray,
+                palette_u32: np.ndarray) -> None:
+    """ Write one frame as PNG, indexed when the palette allows it """
+    if not _fits_indexed(palette_u32):
+        _rgba_image(matrix, palette_u32).save(path, 'PNG')
+        return
+
+    flat, alpha, transparent_idx = _export_palette(palette_u32)
+    img = _indexed_image(matrix, flat, alpha, transparent_idx)
+    img.save(path, 'PNG', transparency=alpha)
+
+
+def _encode_gif(path: str | Path, matrices: list[np.ndarray],
+                palette_u32: np.ndarray, duration: int,
+                loop: int) -> None:
+    """ Write the frames as an animated GIF """
+    if not _fits_indexed(palette_u32):
+        # Too many colors for one GIF palette; Pillow quantizes
+        frames = [_rgba_image(m, palette_u32) for m in matrices]
+        frames[0].save(path, save_all=True, append_images=frames[1:],
+                       duration=duration, loop=loop, disposal=2)
+        return
+
+    flat, alpha, transparent_idx = _export_palette(palette_u32)
+    # One stacked lookup maps every frame to export indices
+    lut = _export_lut(alpha, transparent_idx)
+    indices = lut.take(np.stack(matrices))
+    frames = [_p_image(idx, flat) for idx in indices]
+    frames[0].save(
+        path,
+        save_all=True,
+        append_images=frames[1:],
+        # Frames are already indexed; optimize would only rescan
+        # them all for unused colors, costing far more than it saves
+        optimize=False,
+        duration=duration,
+        loop=loop,
+        disposal=_gif_disposal(indices, transparent_idx),
+        transparency=transparent_idx
+    )
+
+
+def _fits_indexed(palette_u32: np.ndarray) -> bool:
+    """ A 'P' image holds 256 entries: the palette plus a clear slot """
+    return len(palette_u32) <= 256
+
+
+def _rgba_image(matrix: np.ndarray,
+                palette_u32: np.ndarray) -> Image.Image:
+    """ Render a frame to RGBA, as the canvas does (`render_frame`) """
+    height, width = matrix.shape
+    return Image.frombuffer('RGBA', (width, height),
+                            frame_rgba(matrix, palette_u32),
+                            'raw', 'RGBA', 0, 1)
+
+
+def _export_palette(
+        palette_u32: np.ndarray) -> tuple[list[int], bytes, int]:
+    """
+    Flatten the sprite palette for indexed ('P' mode) export.
+
+    Returns the flat RGB palette, the per-entry alpha table and the
+    transparent index. That index is the slot right after the last
+    palette color, keyed to magenta so it never matches a real color.
+    """
+    # Slot 0 of the packed LUT is the clear entry, not a palette color
+    palette = palette_u32[1:].view(np.uint8).reshape(-1, 4)
+    transparent_idx = len(palette)
+    flat = palette[:, :3].ravel().tolist() + [255, 0, 255]
+    alpha = palette[:, 3].tobytes() + b'\x00'
+    return flat, alpha, transparent_idx
+
+
+def _export_lut(alpha: bytes, transparent_idx: int) -> np.ndarray:
+    """
+    Map sprite palette indices to exported ones.
+
+    Entries with zero alpha go to the transparent slot, which is also
+    the LUT's last entry, so a -1 (empty) cell wraps onto it as well.
+    """
+    lut = np.arange(transparent_idx + 1, dtype=np.uint8)
+    lut[np.frombuffer(alpha, dtype=np.uint8) == 0] = transparent_idx
+    return lut
+
+
+def _p_image(idx: np.ndarray, flat_palette: list[int]) -> Image.Image:
+    """ Wrap export indices (`uint8`) in a 'P' image with the palette """
+    height, width = idx.shape
+    img = Image.frombuffer('P', (width, height), idx.tobytes(),
+                           'raw', 'P', 0, 1)
+    img.putpalette(flat_palette)
+    return img
+
+
+def _indexed_image(matrix: np.ndarray, flat_palette: list[int],
+                   alpha: bytes, transparent_idx: int) -> Image.Image:
+    """ Wrap a frame's palette indices in a 'P' image, no RGBA pass """
+    lut = _export_lut(alpha, transparent_idx)
+    return _p_image(lut.take(matrix), flat_palette)
+
+
+def _gif_disposal(indices: np.ndarray, transparent_idx: int) -> int:
+    """
+    Pick the GIF disposal method for an animation.
+
+    Disposal 1 leaves each frame in place, so Pillow only stores the
+    region that changed since the previous one. It cannot clear
+    pixels, though, so any cell turning transparent between frames
+    (the first follows the last when looping) needs disposal 2. It is
+    all-or-nothing: Pillow diffs a frame after a disposal 2 one
+    against a blank canvas, while viewers only clear the cropped
+    region of that frame.
+    """
+    solid = indices != transparent_idx
+    cleared = solid & ~np.roll(solid, -1, axis=0)
+    return 2 if cleared.any() else 1
+
+
+def _quantize(rgba: np.ndarray, palette: np.ndarray) -> np.ndarray:
+    """
+    Map an (H, W, 4) RGBA array to indices of the nearest palette color.
+
+    Distance is the weighted squared RGB difference, ties going to the
+    lower index; pixels with alpha under the cutoff become -1.
+
+    Pixel art uses few distinct colors, so each one is solved once:
+    colors already in the palette are looked up directly and only the
+    rest go through the distance search.
+    """
+    pal = np.asarray(palette)[:, :3].astype(np.int16)
+    height, width = rgba.shape[:2]
+
+    colors, inverse = np.unique(_pack_rgb(rgba[..., :3]).ravel(),
+                                return_inverse=True)
+    mapped = np.empty(len(colors), dtype=PIXEL_DTYPE)
+
+    # Exact hits take the first palette entry with that color, which is
+    # also where the distance search would land
+    keys, first = np.unique(_pack_rgb(pal), return_index=True)
+    pos = np.minimum(np.searchsorted(keys, colors), len(keys) - 1)
+    exact = keys[pos] == colors
+    mapped[exact] = first[pos[exact]]
+
+    rest = colors[~exact]
+    shifts = np.array([16, 8, 0], dtype=np.uint32)
+    mapped[~exact] = _nearest(
+        ((rest[:, None] >> shifts) & 0xFF).astype(np.int16), pal)
+
+    out = mapped[inverse].reshape(height, width)
+    out[rgba[..., 3] < _ALPHA_CUTOFF] = -1
+    return out
+
+
+def _pack_rgb(rgb: np.ndarray) -> np.ndarray:
+    """ Pack the last (R, G, B) axis into one uint32 key per color """
+    rgb = rgb.astype(np.uint32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+
+def _nearest(rgb: np.ndarray, pal: np.ndarray) -> np.ndarray:
+    """
+    Index of the nearest palette color for each (N, 3) int16 color.
+
+    Works in chunks so the (N, K, 3) broadcast temporary stays a few MB.
+    """
+    out = np.empty(len(rgb), dtype=PIXEL_DTYPE)
+    step = max(1, _QUANTIZE_CHUNK // max(1, len(pal) * 3))
+    for i in range(0, len(rgb), step):
+        diff = (rgb[i:i + step, None, :] - pal) * _COLOR_WEIGHTS
+        diff *= diff
+        dist = diff[..., 0] + diff[..., 1] + diff[..., 2]
+        out[i:i + step] = dist.argmin(axis=-1)
+    return out
+
+
+def _load_json(path: Path) -> Any:
+    """ Parse a JSON file, with orjson when it is installed """
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r', encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def _iter_compact(value: Any, indent: int = 2,
+                  level: int = 0) -> Iterator[str]:
+    """
+    Serialize `value` like `json.dumps(value, indent=indent)`, but keep
+    flat integer lists (palette entries, pixel rows) on a single line.
+
+    The text is yielded in chunks, one per line or less; writing them
+    straight to a file avoids building the nested per-level strings, and
+    the whole document, in memory.
+    """
+    if isinstance(value, dict):
+        if not value:
+            yield '{}'
+            return
+        pad = ' ' * (indent * (level + 1))
+        sep = '{\n'
+        for k, v in value.items():
+            yield f'{sep}{pad}{json.dumps(str(k))}: '
+            yield from _iter_compact(v, indent, level + 1)
+            sep = ',\n'
+        yield '\n' + ' ' * (indent * level) + '}'
+        return
+
+    if isinstance(value, (list, tuple)):
+        if not value:
+            yield '[]'
+            return
+        if all(type(v) is int for v in value):
+            yield '[ ' + ', '.join(map(str, value)) + ' ]'
+            return
+        pad = ' ' * (indent * (level + 1))
+        sep = '[\n'
+        for v in value:
+            yield sep + pad
+            yield from _iter_compact(v, indent, level + 1)
+            sep = ',\n'
+        yield '\n' + ' ' * (indent * level) + ']'
+        return
+
+    yield json.dumps(value)
 
 
 # Late import for typing only
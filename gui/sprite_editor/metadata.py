@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 from contextlib import contextmanager
-from typing import Optional
+from typing import Any, Optional
 
 import customtkinter as ctk
 
@@ -23,6 +23,8 @@ class MetadataPanel:
         self.prop_player: Optional[ctk.BooleanVar] = None
         self._save_label: Optional[ctk.CTkLabel] = None
         self._suspend_autoapply = False
+        self._apply_after: Optional[str] = None
+        self._fps_sync_after: Optional[str] = None
 
     def build(self, parent) -> ctk.CTkFrame:
         meta = ctk.CTkFrame(parent)
@@ -110,7 +112,31 @@ class MetadataPanel:
 
         return meta
 
+    def schedule_apply(self) -> None:
+        """ Coalesce bursts of edits into one `apply_metadata` call """
+        if self._suspend_autoapply:
+            return
+        if self._apply_after is not None:
+            self.editor.after_cancel(self._apply_after)
+        self._apply_after = self.editor.after(
+            150, self.apply_metadata)  # type: ignore[arg-type]
+
+    def flush_pending(self) -> None:
+        """ Apply any debounced edit right away (e.g. before saving). """
+        if self._apply_after is not None:
+            self.apply_metadata()
+
+    def _cancel_pending(self) -> None:
+        for name in ('_apply_after', '_fps_sync_after'):
+            after_id = getattr(self, name)
+            if after_id is not None:
+                self.editor.after_cancel(after_id)
+                setattr(self, name, None)
+
     def apply_metadata(self) -> None:
+        if self._apply_after is not None:
+            self.editor.after_cancel(self._apply_after)
+            self._apply_after = None
         if self._suspend_autoapply:
             return
 
@@ -165,39 +191,52 @@ class MetadataPanel:
 
     def refresh_from_doc(self) -> None:
         doc = self.editor.doc
+        self._cancel_pending()
         with self.suspend_autoapply():
-            if self.meta_name:
-                self.meta_name.delete(0, 'end')
-                self.meta_name.insert(0, doc.name)
-            if self.meta_author:
-                self.meta_author.delete(0, 'end')
-                self.meta_author.insert(0, doc.author)
-            if self.meta_fps:
-                self.meta_fps.delete(0, 'end')
-                self.meta_fps.insert(0, doc.fps)
-            if self.meta_tags:
-                self.meta_tags.delete(0, 'end')
-                self.meta_tags.insert(0, ', '.join(doc.tags or []))
-            if self.meta_loop:
-                self.meta_loop.set(doc.loop)
-            if self.prop_collision:
-                self.prop_collision.set(doc.properties.get('collision', False))
-            if self.prop_static:
-                self.prop_static.set(doc.properties.get('static', False))
-            if self.prop_background:
-                self.prop_background.set(
-                    doc.properties.get('background', False))
-            if self.prop_player:
-                self.prop_player.set(doc.properties.get('player', False))
+            self._set_entry(self.meta_name, doc.name)
+            self._set_entry(self.meta_author, doc.author)
+            self._set_entry(self.meta_fps, doc.fps)
+            self._set_entry(self.meta_tags, ', '.join(doc.tags or []))
+            self._set_var(self.meta_loop, doc.loop)
+            self._set_var(self.prop_collision,
+                          doc.properties.get('collision', False))
+            self._set_var(self.prop_static,
+                          doc.properties.get('static', False))
+            self._set_var(self.prop_background,
+                          doc.properties.get('background', False))
+            self._set_var(self.prop_player,
+                          doc.properties.get('player', False))
+
+    @staticmethod
+    def _set_entry(entry: Optional[ctk.CTkEntry], value: Any) -> None:
+        """ Rewrite an entry only if its text differs from `value` """
+        if entry and entry.get() != str(value):
+            entry.delete(0, 'end')
+            entry.insert(0, value)
+
+    @staticmethod
+    def _set_var(var: Optional[ctk.BooleanVar], value: bool) -> None:
+        """ Set a variable only on change, so its traces stay quiet """
+        if var and var.get() != value:
+            var.set(value)
 
     def _bind_autoapply(self, widget, event_type: str = '<FocusOut>') -> None:
         if hasattr(widget, 'bind'):
-            widget.bind(event_type, lambda _event: self.apply_metadata())
+            widget.bind(event_type, lambda _event: self.schedule_apply())
 
     def _on_var_changed(self, *_args) -> None:
-        self.apply_metadata()
+        self.schedule_apply()
 
     def _sync_from_slider(self, *_args) -> None:
+        # Dragging the slider writes the variable on every motion event;
+        # only the last value matters, so update the entry once it settles.
+        if self._fps_sync_after is not None:
+            self.editor.after_cancel(self._fps_sync_after)
+        self._fps_sync_after = self.editor.after(
+            50, self._do_sync_from_slider)  # type: ignore[arg-type]
+
+    def _do_sync_from_slider(self) -> None:
+        self._fps_sync_after = None
         try:
             fps = round(1000 / max(1, self.editor.frame_time_var.get()))
             if self.meta_fps:
@@ -1,13 +1,36 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
+import numpy as np
+
 from gdk.palette import PALETTES
 
 
-@dataclass
+PIXEL_DTYPE = np.int16  # palette index, -1 = transparent
+
+_BLANK_CACHE: dict[tuple[int, int], np.ndarray] = {}
+
+
+def blank_pixels(width: int, height: int) -> np.ndarray:
+    """ Fully transparent (-1) pixel matrix, copied from a cached template """
+    template = _BLANK_CACHE.get((height, width))
+    if template is None:
+        template = np.full((height, width), -1, dtype=PIXEL_DTYPE)
+        template.setflags(write=False)
+        _BLANK_CACHE[(height, width)] = template
+    return template.copy()
+
+
+def frame_rgba(pixels: np.ndarray, palette_u32: np.ndarray) -> np.ndarray:
+    """ Render a pixel matrix to (H, W, 4) RGBA via `SpriteDoc.palette_u32` """
+    packed = palette_u32.take(pixels + 1)  # -1 -> the clear slot
+    return packed.view(np.uint8).reshape(*pixels.shape, 4)
+
+
+@dataclass(slots=True)
 class SpriteFrame:
     """Represents a single frame (2D matrix of palette indices)."""
-    pixels: list[list[int]]
+    pixels: np.ndarray
 
 
 @dataclass
@@ -25,6 +48,8 @@ class SpriteDoc:
     tags: list[str] = None
     properties: dict[str, Any] = None
     palette_name: str = 'ProtoX 64'
+    _palette_cache: tuple[list[list[int]], np.ndarray, np.ndarray] | None = (
+        field(default=None, init=False, repr=False, compare=False))
 
     # -------------------------------------------------------------------------
     # Factory
@@ -34,7 +59,7 @@ class SpriteDoc:
               name: str = 'unnamed',
               palette_name: str = 'ProtoX 64') -> "SpriteDoc":
         """Create an empty sprite with a blank frame and default metadata."""
-        blank = [[-1 for _ in range(width)] for _ in range(height)]
+        blank = blank_pixels(width, height)
         return SpriteDoc(
             width=width,
             height=height,
@@ -51,6 +76,38 @@ class SpriteDoc:
             }
         )
 
+    # -------------------------------------------------------------------------
+    # Palette lookup
+    # -------------------------------------------------------------------------
+    def palette_u32(self) -> np.ndarray:
+        """
+        Return the palette as one packed RGBA `uint32` per entry.
+
+        Slot 0 is fully transparent and palette index `i` lives at `i + 1`,
+        so a frame renders with a single gather (see `frame_rgba`).
+        Rebuilt only when `palette` is replaced (palettes are swapped, never
+        edited in place), not on every redraw.
+        """
+        return self._palette_arrays()[0]
+
+    def palette_rgba(self) -> np.ndarray:
+        """ Return the palette as a read-only (K, 4) `uint8` array. """
+        return self._palette_arrays()[1]
+
+    def _palette_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        cached = self._palette_cache
+        if cached is None or cached[0] is not self.palette:
+            rgba = np.zeros((len(self.palette) + 1, 4), dtype=np.uint8)
+            if self.palette:
+                rgba[1:] = np.asarray(self.palette, dtype=np.uint8)
+            lut = rgba.view(np.uint32).ravel()
+            entries = rgba[1:]
+            lut.setflags(write=False)
+            entries.setflags(write=False)
+            cached = (self.palette, lut, entries)
+            self._palette_cache = cached
+        return cached[1], cached[2]
+
     # -------------------------------------------------------------------------
     # Serialization
     # -------------------------------------------------------------------------
@@ -67,12 +124,17 @@ class SpriteDoc:
             'properties': self.properties or {},
             'palette_name': self.palette_name,
             'palette': self.palette,
-            'frames': [f.pixels for f in self.frames]
+            'frames': [f.pixels.tolist() for f in self.frames]
         }
 
     @staticmethod
     def from_json(d: dict) -> "SpriteDoc":
-        """Reconstruct a SpriteDoc from JSON data."""
+        """
+        Reconstruct a SpriteDoc from JSON data.
+
+        Each frame matrix is converted to an ndarray in one C-level pass
+        instead of being rebuilt cell by cell.
+        """
         palette_name = d.get('palette_name', 'ProtoX 64')
         palette = PALETTES.get(palette_name, d.get('palette', []))
 
@@ -86,10 +148,8 @@ class SpriteDoc:
             tags=d.get('tags', []),
             palette=palette,
             palette_name=palette_name,
-            frames=[
-                SpriteFrame([[int(v) for v in row] for row in m])
-                for m in d['frames']
-            ],
+            frames=[SpriteFrame(np.asarray(m, dtype=PIXEL_DTYPE))
+                    for m in d['frames']],
             properties=d.get(
                 'properties',
                 {
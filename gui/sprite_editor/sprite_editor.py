@@ -1,18 +1,20 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional, Any
 from functools import partial, lru_cache
 import logging
+import time
 
 import customtkinter as ctk
-from PIL import Image
+import numpy as np
+from PIL import Image, ImageTk
 from customtkinter import CTkFrame
 
 from gdk.palette import PALETTES
-from gdk.utils import rgba_hex
 from .canvas_view import CanvasView
-from .sprite_core import SpriteFrame, SpriteDoc
+from .sprite_core import SpriteFrame, SpriteDoc, blank_pixels
 from .io_manager import SpriteIOManager
 from .metadata import MetadataPanel
 
@@ -46,7 +48,13 @@ class SpriteEditor(ctk.CTkFrame):
 
         # Default values
         self.fill_mode = False
-        self.palette_buttons: list[ctk.CTkButton] = []
+        self._suspend_refresh = False
+        self.palette_canvas: Optional[ctk.CTkCanvas] = None
+        self._palette_photo: Optional[ImageTk.PhotoImage] = None
+        self._palette_sel_id: Optional[int] = None
+        self._prev_selected_idx: Optional[int] = None
+        self._palette_cols = self.cols
+        self._palette_pitch = self.btn_size + 6
 
         # Helper components
         self.canvas_view = CanvasView(self)
@@ -131,8 +139,8 @@ class SpriteEditor(ctk.CTkFrame):
           - Special buttons for transparency and fill modes
           - A zoom slider that scales the canvas cell size
 
-        Handles layout with compact frames and dynamically binds
-        each palette button to `select_color()`.
+        Handles layout with compact frames; the color grid is a single
+        canvas that maps clicks back to `select_color()`.
         """
         box = ctk.CTkFrame(self)
         box.grid(row=1, column=0, sticky='nsw', padx=self.padding,
@@ -158,8 +166,7 @@ class SpriteEditor(ctk.CTkFrame):
             self._set_palette_button_config(choice)
             self.rebuild_color_buttons(
                 self.palette_frame, self.cols, self.btn_size)
-            self.canvas_view.redraw_canvas()
-            self.canvas_view.update_preview()
+            self.canvas_view.refresh()
 
         ctk.CTkOptionMenu(
             header_frame,
@@ -188,7 +195,7 @@ class SpriteEditor(ctk.CTkFrame):
             text='Transparent',
             width=80, height=22,
             fg_color='#000000',
-            command=lambda: self.select_color(-1))
+            command=partial(self.select_color, -1))
         self.transparent_button.grid(row=0, column=0, pady=2)
 
         self.fill_button = ctk.CTkButton(
@@ -197,7 +204,7 @@ class SpriteEditor(ctk.CTkFrame):
             width=80,
             height=22,
             fg_color='#426aad',
-            command=lambda: self._enable_fill_mode())
+            command=self._enable_fill_mode)
         self.fill_button.grid(row=1, column=0, pady=2)
 
         # zoom slider (full-width, compact) ---
@@ -231,27 +238,52 @@ class SpriteEditor(ctk.CTkFrame):
             self.btn_size = 20
 
     def rebuild_color_buttons(self, frame, cols: int, btn_size: int) -> None:
-        """ Clear and rebuild color buttons when palette changes """
+        """
+        Clear and rebuild the color grid when the palette changes.
+
+        The swatches are rendered into one image on a single canvas instead
+        of one button per color; clicks are hit-tested back to an index.
+        """
         for child in frame.winfo_children():
             child.destroy()
 
-        self.palette_buttons.clear()
-
-        for i, rgba in enumerate(self.doc.palette):
-            btn = ctk.CTkButton(
-                frame,
-                text='',
-                width=btn_size,
-                height=btn_size,
-                fg_color=rgba_hex(rgba),
-                corner_radius=4,
-                border_width=0,
-                border_color='#222',
-                command=lambda idx=i: self.select_color(idx)
-            )
-            r, c = divmod(i, cols)
-            btn.grid(row=r, column=c, padx=3, pady=3)
-            self.palette_buttons.append(btn)
+        pitch = btn_size + 6
+        count = len(self.doc.palette)
+        rows = -(-count // cols)
+
+        # Opaque swatch per palette slot, transparent padding + gaps
+        colors = np.zeros((rows * cols, 4), dtype=np.uint8)
+        colors[:count, :3] = self.doc.palette_rgba()[:, :3]
+        colors[:count, 3] = 255
+        cells = np.zeros((rows, cols, pitch, pitch, 4), dtype=np.uint8)
+        cells[:, :, 3:3 + btn_size, 3:3 + btn_size] = (
+            colors.reshape(rows, cols, 1, 1, 4))
+        swatch = cells.transpose(0, 2, 1, 3, 4).reshape(
+            rows * pitch, cols * pitch, 4)
+
+        canvas = ctk.CTkCanvas(frame, width=cols * pitch,
+                               height=rows * pitch, bg='#333333',
+                               highlightthickness=0)
+        canvas.grid(row=0, column=0)
+        self._palette_photo = ImageTk.PhotoImage(
+            Image.fromarray(swatch, 'RGBA'))
+        canvas.create_image(0, 0, anchor='nw', image=self._palette_photo)
+        self._palette_sel_id = canvas.create_rectangle(
+            0, 0, 0, 0, outline='#ffffff', width=2, state='hidden')
+
+        def _on_click(event) -> None:
+            idx = (event.y // pitch) * cols + event.x // pitch
+            if 0 <= event.x < cols * pitch and 0 <= idx < count:
+                self.select_color(idx)
+
+        canvas.bind('<Button-1>', _on_click)
+        self.palette_canvas = canvas
+        self._palette_cols = cols
+        self._palette_pitch = pitch
+        self._prev_selected_idx = None
+
+        if 0 <= self.active_color_index < count:
+            self.select_color(self.active_color_index)
 
     def _remap_palette(self, old_palette: list[list[int]],
                        new_palette: list[list[int]]) -> None:
@@ -280,21 +312,20 @@ class SpriteEditor(ctk.CTkFrame):
                     best_idx = j
             mapping[i] = best_idx
 
+        lut = np.array([mapping.get(i, 0) for i in range(len(old_palette))],
+                       dtype=np.int16)
         total = changed = 0
         for frame in self.doc.frames:
-            for y, row in enumerate(frame.pixels):
-                for x, val in enumerate(row):
-                    if val < 0 or val >= len(old_palette):
-                        continue
-                    total += 1
-                    new_val = mapping.get(val, 0)
-                    if new_val != val:
-                        changed += 1
-                    row[x] = new_val
+            pixels = frame.pixels
+            mask = (pixels >= 0) & (pixels < len(old_palette))
+            old_vals = pixels[mask]
+            new_vals = lut[old_vals]
+            total += old_vals.size
+            changed += int(np.count_nonzero(new_vals != old_vals))
+            pixels[mask] = new_vals
 
         self.doc.palette = new_palette
-        self.canvas_view.redraw_canvas()
-        self.canvas_view.update_preview()
+        self.canvas_view.refresh()
 
         logging.info(f'Palette remapped {changed}/{total} pixels '
                      f'({len(old_palette)} -> {len(new_palette)})')
@@ -342,6 +373,7 @@ class SpriteEditor(ctk.CTkFrame):
         strip = ctk.CTkFrame(right)
         strip.grid(padx=8, pady=8, sticky='n')
         self.frame_buttons: list[ctk.CTkButton] = []
+        self._highlighted_frame: Optional[int] = None
         self.frames_strip = strip
 
         # Actions
@@ -430,17 +462,17 @@ class SpriteEditor(ctk.CTkFrame):
         if len(self.doc.frames) <= 1:
             return
         start = self.active_frame
+        count = len(self.doc.frames)
+        # Render every frame up front; each step then only swaps photos
+        photos = [self.canvas_view.frame_photo((start + i) % count)
+                  for i in range(count)]
 
         def step(i=0) -> None:
-            self.active_frame = (start + i) % len(self.doc.frames)
-            self.canvas_view.redraw_canvas()
-            self.canvas_view.update_preview()
-            if i + 1 < len(self.doc.frames):
+            if i < count:
+                self.canvas_view.show_photo(photos[i])
                 self.after(90, step, i + 1)
             else:
-                self.active_frame = start
-                self.canvas_view.redraw_canvas()
-                self.canvas_view.update_preview()
+                self.canvas_view.refresh()
 
         step(0)
 
@@ -449,53 +481,110 @@ class SpriteEditor(ctk.CTkFrame):
         if getattr(self, '_is_playing', False):
             return
         self._is_playing = True
+        self._play_deadline = time.monotonic()
         self._loop_step(0)
 
     def _loop_step(self, i: int) -> None:
         if not getattr(self, '_is_playing', False):
             return
         self.active_frame = i % len(self.doc.frames)
+        # Canvas only; the preview would just mirror it while playing.
+        # Drawn now rather than via schedule_redraw so the deadline below
+        # is measured after the render it has to account for.
         self.canvas_view.redraw_canvas()
-        self.canvas_view.update_preview()
-        delay = max(1, self.frame_time_var.get())
+
+        # Fixed phase: each tick is due one period after the previous
+        # deadline, not after this redraw, so render time doesn't drift.
+        now = time.monotonic()
+        period = max(1, self.frame_time_var.get()) / 1000
+        self._play_deadline = max(self._play_deadline + period, now)
+        delay = max(1, int((self._play_deadline - now) * 1000))
         self.after(delay, self._loop_step, self.active_frame + 1)
 
     def _stop_playback(self) -> None:
         """ Stop looping playback """
+        if not getattr(self, '_is_playing', False):
+            return
         self._is_playing = False
+        self.canvas_view.update_preview()
 
     def refresh_all(self) -> None:
+        if self._suspend_refresh:
+            return
         self._rebuild_frames_strip()
-        self.canvas_view.redraw_canvas()
-        self.canvas_view.update_preview()
+        self.canvas_view.refresh()
+
+    @contextmanager
+    def batched_updates(self):
+        """ Defer `refresh_all` calls in the block to a single one at exit """
+        previous = self._suspend_refresh
+        self._suspend_refresh = True
+        try:
+            yield
+        finally:
+            self._suspend_refresh = previous
+            if not previous:
+                self.refresh_all()
 
     def _rebuild_frames_strip(self) -> None:
-        for b in self.frame_buttons:
-            b.destroy()
-        self.frame_buttons.clear()
-
-        for idx, _ in enumerate(self.doc.frames):
-            def switch(i=idx) -> None:
-                self.active_frame = i
-                self.canvas_view.redraw_canvas()
-                self.canvas_view.update_preview()
-                self._rebuild_frames_strip()
-
-            label = f'[{idx + 1}]'
+        """
+        Match the strip to the document's frame count.
+
+        Buttons only depend on their index, so existing ones are kept;
+        missing ones are appended and surplus ones destroyed.
+        """
+        while len(self.frame_buttons) > len(self.doc.frames):
+            self.frame_buttons.pop().destroy()
+            if self._highlighted_frame == len(self.frame_buttons):
+                self._highlighted_frame = None
+
+        for idx in range(len(self.frame_buttons), len(self.doc.frames)):
             btn = ctk.CTkButton(
-                self.frames_strip, text=label, width=60, command=switch)
-            if idx == self.active_frame:
-                btn.configure(fg_color='#2255aa')
+                self.frames_strip, text=f'[{idx + 1}]', width=60,
+                command=partial(self._switch_frame, idx))
             btn.grid(padx=2, pady=2)
             self.frame_buttons.append(btn)
 
+        self._highlight_frame_button(self.active_frame)
+
+    def _switch_frame(self, idx: int) -> None:
+        self.active_frame = idx
+        self.canvas_view.refresh()
+        self._highlight_frame_button(idx)
+
+    def _highlight_frame_button(self, idx: int) -> None:
+        """ Recolor only the previously and newly active frame buttons """
+        if idx == self._highlighted_frame:
+            return
+        prev = self._highlighted_frame
+        if prev is not None and prev < len(self.frame_buttons):
+            self.frame_buttons[prev].configure(
+                fg_color=ctk.ThemeManager.theme['CTkButton']['fg_color'])
+        if idx < len(self.frame_buttons):
+            self.frame_buttons[idx].configure(fg_color='#2255aa')
+            self._highlighted_frame = idx
+        else:
+            self._highlighted_frame = None
+
     def select_color(self, idx: int) -> None:
         self.active_color_index = idx
-        for i, btn in enumerate(self.palette_buttons):
-            if i == idx:
-                btn.configure(border_color='#ffffff', border_width=0)
-            else:
-                btn.configure(border_color='#222', border_width=0)
+        if self.palette_canvas is None or self._palette_sel_id is None:
+            return
+        if idx == self._prev_selected_idx:
+            return
+        self._prev_selected_idx = idx
+        if idx < 0:
+            self.palette_canvas.itemconfigure(
+                self._palette_sel_id, state='hidden')
+            return
+        pitch = self._palette_pitch
+        r, c = divmod(idx, self._palette_cols)
+        self.palette_canvas.coords(
+            self._palette_sel_id,
+            c * pitch + 2, r * pitch + 2,
+            (c + 1) * pitch - 2, (r + 1) * pitch - 2)
+        self.palette_canvas.itemconfigure(
+            self._palette_sel_id, state='normal')
 
     def _enable_fill_mode(self) -> None:
         """ Enable fill mode, changes color of button to reflect state """
@@ -507,16 +596,14 @@ class SpriteEditor(ctk.CTkFrame):
 
     def _add_frame(self) -> None:
         """ Add a new blank frame """
-        blank = [[-1 for _ in range(self.doc.width)] for _ in
-                 range(self.doc.height)]
+        blank = blank_pixels(self.doc.width, self.doc.height)
         self.doc.frames.append(SpriteFrame(blank))
         self.active_frame = len(self.doc.frames) - 1
         self.refresh_all()
 
     def _dup_frame(self) -> None:
         """ Duplicates the selected frame """
-        src = self.doc.frames[self.active_frame].pixels
-        dup = [row[:] for row in src]
+        dup = self.doc.frames[self.active_frame].pixels.copy()
         self.doc.frames.append(SpriteFrame(dup))
         self.active_frame = len(self.doc.frames) - 1
         self.refresh_all()
@@ -530,20 +617,16 @@ class SpriteEditor(ctk.CTkFrame):
         self.refresh_all()
 
     def _clear_frame(self) -> None:
-        self.doc.frames[self.active_frame].pixels = [
-            [-1 for _ in range(self.doc.width)] for _ in
-            range(self.doc.height)]
+        self.doc.frames[self.active_frame].pixels.fill(-1)
         self.refresh_all()
 
     def resize_grid(self, w: int, h: int) -> None:
         """ Safe resize while keeping content where it fits (top-left) """
+        min_h, min_w = min(h, self.doc.height), min(w, self.doc.width)
         new_frames: list[SpriteFrame] = []
         for frame in self.doc.frames:
-            new = [[-1 for _ in range(w)] for _ in range(h)]
-            for y in range(min(h, self.doc.height)):
-                row = frame.pixels[y]
-                for x in range(min(w, self.doc.width)):
-                    new[y][x] = row[x]
+            new = blank_pixels(w, h)
+            new[:min_h, :min_w] = frame.pixels[:min_h, :min_w]
             new_frames.append(SpriteFrame(new))
         self.doc.width, self.doc.height = w, h
         self.doc.frames = new_frames
@@ -1,7 +1,17 @@
+import json
+from types import SimpleNamespace
+
 import customtkinter as ctk
+import numpy as np
 import pytest
+from PIL import Image, ImageSequence
 
-from gui.sprite_editor import SpriteEditor
+from gdk.palette import PALETTES
+from gui.sprite_editor import SpriteDoc, SpriteEditor, SpriteFrame
+from gui.sprite_editor.canvas_view import CanvasView
+from gui.sprite_editor.io_manager import (
+    SpriteIOManager, _encode_gif, _encode_png, _export_lut, _export_palette,
+    _gif_disposal, _iter_compact, _quantize)
 
 
 @pytest.fixture
@@ -45,3 +55,196 @@ def test_color_select_highlights_button(app):
     app.select_color(2)
     app.update_idletasks()
     assert app.active_color_index == 2
+
+
+def test_save_format_keeps_int_lists_inline():
+    text = ''.join(_iter_compact({'name': 'x', 'frames': [[[-1, 0], [1, 2]]]}))
+    assert '[ -1, 0 ]' in text
+    assert json.loads(text) == {'name': 'x', 'frames': [[[-1, 0], [1, 2]]]}
+
+
+def test_doc_json_roundtrip_keeps_pixels():
+    original = SpriteDoc.empty(16, 12, PALETTES['ProtoX 64'])
+    original.frames[0].pixels[1][2] = 5
+    data = json.loads(json.dumps(original.to_json()))
+    doc = SpriteDoc.from_json(data)
+    assert doc.frames[0].pixels[1][2] == 5
+    assert doc.frames[0].pixels[0][0] == -1
+    assert doc.frames[0].pixels.shape == (original.height, original.width)
+
+
+def test_flood_fill_stops_at_other_colors():
+    pixels = np.full((16, 16), -1, dtype=np.int16)
+    pixels[:, 4] = 2  # wall down column 4
+    CanvasView._flood_fill(pixels, 0, 0, -1, 1)
+    assert (pixels[:, :4] == 1).all()
+    assert (pixels[:, 5:] == -1).all()
+
+
+def _reference_fill(matrix, x, y, target, replacement):
+    """ Plain per-cell 4-way fill """
+    height, width = matrix.shape
+    stack = [(x, y)]
+    while stack:
+        cx, cy = stack.pop()
+        if 0 <= cx < width and 0 <= cy < height and matrix[cy, cx] == target:
+            matrix[cy, cx] = replacement
+            stack += [(cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)]
+
+
+def _comb(size):
+    """ 1 px vertical corridors joined alternately at top and bottom """
+    pixels = np.full((size, size), -1, dtype=np.int16)
+    pixels[1:, 1::4] = 3
+    pixels[:-1, 3::4] = 3
+    return pixels
+
+
+def _noise(size):
+    rng = np.random.default_rng(3)
+    return np.where(rng.random((size, size)) < 0.75, -1, 3).astype(np.int16)
+
+
+@pytest.mark.parametrize('make', [_comb, _noise])
+def test_flood_fill_matches_per_cell_fill_on_textured_regions(make):
+    pixels = make(48)
+    pixels[0, 0] = -1
+    expected = pixels.copy()
+    _reference_fill(expected, 0, 0, -1, 1)
+    CanvasView._flood_fill(pixels, 0, 0, -1, 1)
+    assert (pixels == expected).all()
+    assert (pixels == 1).sum() > pixels.size // 2
+
+
+def test_quantize_maps_palette_colors_and_alpha(app):
+    palette = app.doc.palette
+    rgba = np.array([[palette[3], palette[7], (0, 0, 0, 10)]], dtype=np.uint8)
+    rgba[0, :2, 3] = 255
+    assert _quantize(rgba, palette).tolist() == [[3, 7, -1]]
+    assert app._find_closest_color(tuple(palette[5][:3]) + (255,)) == 5
+
+
+def test_find_closest_color_clamps_out_of_range_channels():
+    doc = SpriteDoc.empty(2, 2, PALETTES['ProtoX 64'])
+    io = SpriteIOManager(SimpleNamespace(doc=doc))
+    white = doc.palette.index([255, 255, 255, 255])
+    assert io.find_closest_color((300, 256, 999, 255)) == white
+    assert io.find_closest_color((0, 0, 0, -40)) == -1
+
+
+def _reference_quantize(rgba, palette):
+    """ Plain per-pixel nearest-color search, ties to the lower index """
+    out = []
+    for row in rgba.tolist():
+        out.append([])
+        for r, g, b, a in row:
+            if a < 32:
+                out[-1].append(-1)
+                continue
+            best, best_dist = -1, None
+            for k, (pr, pg, pb, _) in enumerate(palette):
+                dist = (((r - pr) * 0.3) ** 2 + ((g - pg) * 0.59) ** 2
+                        + ((b - pb) * 0.11) ** 2)
+                if best_dist is None or dist < best_dist:
+                    best, best_dist = k, dist
+            out[-1].append(best)
+    return out
+
+
+def test_quantize_matches_reference_search():
+    palette = PALETTES['ProtoX 64']
+    # Entries 0 and 1 share RGB 0,0,0; both exact and near hits take 0
+    assert palette[0][:3] == palette[1][:3]
+    rng = np.random.default_rng(7)
+    rgba = rng.integers(0, 256, size=(12, 16, 4), dtype=np.uint8)
+    rgba[..., 3] = np.where(rgba[..., 3] < 64, rgba[..., 3], 255)
+    rgba[0, :4] = [(0, 0, 0, 255), (1, 1, 1, 255), (2, 0, 1, 255),
+                   tuple(palette[9][:3]) + (255,)]
+    # Repeat colors so the dedupe path maps shared colors back out
+    rgba[-1] = rgba[0, :1]
+
+    expected = _reference_quantize(rgba, palette)
+    assert expected[0][:3] == [0, 0, 0]
+    assert _quantize(rgba, palette).tolist() == expected
+
+
+def _assert_gif_matches_render(path, doc):
+    """ Every decoded GIF frame, and the loop back, shows render_frame """
+    view = CanvasView(SimpleNamespace(doc=doc))
+
+    def check(i, image):
+        got = np.asarray(image)
+        want = np.asarray(view.render_frame(i))
+        # GIF has no partial alpha: anything visible is drawn opaque
+        visible = want[..., 3] > 0
+        assert ((got[..., 3] > 0) == visible).all()
+        assert (got[..., :3][visible] == want[..., :3][visible]).all()
+
+    with Image.open(path) as gif:
+        count = 0
+        # The iterator re-seeks one image, so compare each frame in place
+        for i, frame in enumerate(ImageSequence.Iterator(gif)):
+            count += 1
+            check(i, frame.convert('RGBA'))
+        assert count == len(doc.frames)
+
+        # Pillow restarts from a blank canvas on seek(0), but a looping
+        # viewer disposes the last frame and draws the first over it
+        canvas = gif.convert('RGBA')
+        if gif.disposal_method == 2:
+            canvas.paste((0, 0, 0, 0), gif.dispose_extent)
+        gif.seek(0)
+        box = gif.dispose_extent
+        canvas.alpha_composite(gif.convert('RGBA').crop(box), box[:2])
+        check(0, canvas)
+
+
+def test_export_falls_back_to_rgba_for_large_palettes(tmp_path):
+    palette = [[i % 256, i * 7 % 256, i * 13 % 256, 255] for i in range(300)]
+    doc = SpriteDoc.empty(6, 4, palette)
+    doc.frames[0].pixels[:2] = 299
+    doc.frames[0].pixels[3, 1] = 7
+    doc.frames.append(SpriteFrame(doc.frames[0].pixels.copy()))
+    doc.frames[1].pixels[0, 0] = -1
+
+    png = tmp_path / 'big.png'
+    _encode_png(png, doc.frames[0].pixels, doc.palette_u32())
+    want = CanvasView(SimpleNamespace(doc=doc)).render_frame(0)
+    assert Image.open(png).convert('RGBA').tobytes() == want.tobytes()
+
+    gif = tmp_path / 'big.gif'
+    _encode_gif(gif, [f.pixels for f in doc.frames], doc.palette_u32(), 100, 0)
+    _assert_gif_matches_render(gif, doc)
+
+
+def _cells(*cells):
+    """ 3x4 frame pixels with the given (row, col, index) cells set """
+    frame = SpriteFrame(np.full((3, 4), -1, dtype=np.int16))
+    for row, col, index in cells:
+        frame.pixels[row, col] = index
+    return frame
+
+
+@pytest.mark.parametrize('frames, disposal', [
+    # Same opaque cells throughout, only colors change
+    ([_cells((0, 0, 2), (1, 1, 5)), _cells((0, 0, 5), (1, 1, 2)),
+      _cells((0, 0, 9), (1, 1, 9))], 1),
+    # The second frame clears a cell the first one drew
+    ([_cells((0, 0, 2), (1, 1, 5)), _cells((0, 0, 2)),
+      _cells((0, 0, 2), (2, 3, 9))], 2),
+    # Only the loop back from the last frame to the first clears
+    ([_cells((0, 0, 2)), _cells((0, 0, 5), (2, 3, 9))], 2),
+])
+def test_gif_export_decodes_to_rendered_frames(tmp_path, frames, disposal):
+    doc = SpriteDoc.empty(4, 3, PALETTES['ProtoX 64'])
+    doc.frames = frames
+    matrices = [f.pixels for f in frames]
+    palette_u32 = doc.palette_u32()
+
+    flat, alpha, transparent_idx = _export_palette(palette_u32)
+    indices = _export_lut(alpha, transparent_idx).take(np.stack(matrices))
+    assert _gif_disposal(indices, transparent_idx) == disposal
+
+    path = tmp_path / 'anim.gif'
+    _encode_gif(path, matrices, palette_u32, 100, 0)
+    _assert_gif_matches_render(path, doc)